@@ -18,12 +18,15 @@ import shutil
 import signal
 import time
 from collections import deque
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from threading import Lock
 
 import click
 import requests
+import urllib3
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from caa_importer import CAAImporter
 from caa_monitor import CAAServiceMonitor
@@ -63,6 +66,30 @@ class CAADownloader:
         self.headers = {"User-Agent": USER_AGENT}
         self.batch_size = batch_size
         self.download_threads = download_threads
+
+        # Shared session so worker threads reuse pooled keep-alive connections
+        # instead of paying a TCP+TLS handshake to archive.org per image.
+        # urllib3's connection pool is thread-safe, so one session sized to the
+        # thread count is sufficient.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Retry transient server errors inside the connection pool; this
+        # honours archive.org's Retry-After header instead of hammering a
+        # rate-limited endpoint with our own fixed backoff.
+        retries = Retry(
+            total=5,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+            allowed_methods=["GET"],
+        )
+        adapter = HTTPAdapter(
+            pool_connections=download_threads,
+            pool_maxsize=download_threads,
+            pool_block=True,
+            max_retries=retries,
+        )
+        self.session.mount("https://", adapter)
         self.total = 0
         self.downloaded = 0
         self.errors = 0
@@ -75,6 +102,17 @@ class CAADownloader:
         self.cycle_download_errors = 0
         self.lock = Lock()
         self._shutdown_requested = False
+        # Status updates queued by worker threads; flushed in bulk by
+        # run_downloader so workers never write to SQLite directly.
+        self._pending_updates = []
+        # Directories we have already created: with the prefix layout there
+        # are only a few hundred, so caching them skips the stat+mkdir pair
+        # os.makedirs issues for every single image. Races are benign
+        # (exist_ok=True), so no lock is needed around the set.
+        self._known_dirs: set[str] = set()
+        # (sampled_at, stats) pair for the disk usage TTL cache; the initial
+        # timestamp guarantees the first call takes a real sample
+        self._disk_usage_cache = (float("-inf"), (None, None, None, None))
         self._growth_tracker_initialized = False
 
         # Queue to track download completion times for rate calculation
@@ -89,6 +127,25 @@ class CAADownloader:
         self.growth_tracker = DiskGrowthTracker(path=self.images_dir, downloader=self)
         self.growth_tracker.start()
 
+    def warm_connections(self):
+        """Pre-establish pooled TLS connections to archive.org.
+
+        Filling the pool up front means no worker thread pays the TCP+TLS
+        handshake cost on its first real download. Failures are ignored —
+        this is purely an optimisation.
+        """
+
+        def _warm_one():
+            try:
+                # HEAD has no body, so the connection goes straight back
+                # into the pool ready for reuse
+                self.session.head("https://archive.org/", timeout=5)
+            except requests.exceptions.RequestException:
+                pass
+
+        with ThreadPoolExecutor(max_workers=self.download_threads) as executor:
+            wait([executor.submit(_warm_one) for _ in range(self.download_threads)])
+
     def get_download_rate(self):
         """
         Calculate the current download rate based on recent download completion times.
@@ -109,19 +166,31 @@ class CAADownloader:
             # Rate = number of downloads / time elapsed
             return (len(self.download_times) - 1) / time_elapsed
 
+    # How long a disk usage sample stays fresh (seconds)
+    DISK_USAGE_TTL = 5.0
+
     def get_disk_usage_stats(self):
         """
         Safely retrieve disk usage statistics for the cache directory.
 
+        The result is cached for DISK_USAGE_TTL seconds so frequent monitor
+        scrapes don't hit statvfs on every request. The cache is a single
+        tuple assignment, which is atomic in CPython, so no lock is needed.
+
         Returns:
             tuple: (total_bytes, free_bytes, used_bytes, used_percent)
                    Returns (None, None, None, None) if unavailable.
         """
+        sampled_at, cached = self._disk_usage_cache
+        if time.monotonic() - sampled_at < self.DISK_USAGE_TTL:
+            return cached
         if self.images_dir and os.path.exists(self.images_dir):
             try:
                 total, used, free = shutil.disk_usage(self.images_dir)
                 used_percent = (used / total * 100) if total else 0
-                return total, free, used, used_percent
+                stats = (total, free, used, used_percent)
+                self._disk_usage_cache = (time.monotonic(), stats)
+                return stats
             except Exception as exc:
                 logging.warning("Failed to get disk usage for images_dir '%s': %s", self.images_dir, exc)
         return None, None, None, None
@@ -157,6 +226,22 @@ class CAADownloader:
             "cycle_download_errors": self.cycle_download_errors,
         }
 
+    def _queue_update(self, release_mbid: str, caa_id: int, status: CoverStatus, error: str | None = None):
+        """Queue a status update for the next bulk flush.
+
+        Batching the updates into one transaction per batch avoids per-image
+        commits and the writer lock contention they cause under many threads.
+        """
+        with self.lock:
+            self._pending_updates.append((release_mbid, caa_id, status, error))
+
+    def _flush_pending_updates(self):
+        """Write all queued status updates to the datastore in one transaction."""
+        with self.lock:
+            updates, self._pending_updates = self._pending_updates, []
+        if updates:
+            self.datastore.bulk_update_status(updates)
+
     def _verify_after_download(self, release_mbid: str, caa_id: int, filepath: str, extension: str) -> str | None:
         """Verify a just-downloaded file against IA metadata.
 
@@ -198,34 +283,52 @@ class CAADownloader:
 
         Returns the release_mbid and caa_id on completion.
         """
-        # The record object must have 'mbid' and 'caa_id' attributes
-        # to function correctly.
-        try:
-            release_mbid = record.release_mbid
-            caa_id = record.caa_id
-        except AttributeError as e:
-            logging.error(f"A record object is missing a required attribute: {e}")
-            return None, None
-
-        mime_type = getattr(record, "mime_type", None)
+        # get_batch yields fixed-shape namedtuples, so plain attribute access
+        # is safe — no need for defensive hasattr/getattr per record.
+        release_mbid = record.release_mbid
+        caa_id = record.caa_id
+        mime_type = record.mime_type
         extension = extension_from_mime(mime_type)
         url = build_download_url(release_mbid, caa_id, extension)
         filepath = build_image_path(self.images_dir, release_mbid, caa_id, extension)
 
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        # Warm-start fast path: after a crash or a database restore the file
+        # may already be on disk, so a single stat saves the whole HTTPS
+        # round-trip. Empty files are treated as absent and re-downloaded.
+        try:
+            if os.path.getsize(filepath) > 0:
+                self._queue_update(release_mbid, caa_id, CoverStatus.DOWNLOADED)
+                return release_mbid, caa_id
+        except OSError:
+            pass
+
+        target_dir = os.path.dirname(filepath)
+        if target_dir not in self._known_dirs:
+            os.makedirs(target_dir, exist_ok=True)
+            self._known_dirs.add(target_dir)
         status = CoverStatus.DOWNLOADED
         error = None
 
         # Download the file first (no retry — network errors are handled separately)
+        # The body is streamed straight to a temp file in chunks so the full
+        # image is never held in memory; the final os.replace() is atomic.
+        tmp_filepath = filepath + ".tmp"
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-
-            tmp_filepath = filepath + ".tmp"
-            with open(tmp_filepath, "wb") as f:
-                f.write(response.content)
+            with self.session.get(url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                # Copy straight from the urllib3 stream into the file,
+                # avoiding the per-chunk bytes objects iter_content creates
+                response.raw.decode_content = True
+                with open(tmp_filepath, "wb") as f:
+                    shutil.copyfileobj(response.raw, f, length=1024 * 1024)
+                    # Images are written once and never read back by this
+                    # process, so tell the kernel not to keep their pages
+                    # cached — that leaves more room for SQLite's pages.
+                    if hasattr(os, "posix_fadvise"):
+                        f.flush()
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            downloaded_bytes = os.path.getsize(tmp_filepath)
             os.replace(tmp_filepath, filepath)
-            downloaded_bytes = len(response.content)
 
         except requests.exceptions.HTTPError as e:
             if 400 <= e.response.status_code < 500:
@@ -235,23 +338,26 @@ class CAADownloader:
             else:
                 status = CoverStatus.TEMP_ERROR
                 error = str(e)
-            self.datastore.update(
-                release_mbid=record.release_mbid, caa_id=record.caa_id, new_status=status, error=error
-            )
+            self._queue_update(release_mbid, caa_id, status, error)
             return None, None
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, OSError) as e:
+            # Reading response.raw directly bypasses requests' exception
+            # wrapping, so mid-body failures surface as raw urllib3 errors
+            # (ProtocolError, ReadTimeoutError, DecodeError) or socket-level
+            # OSErrors rather than RequestException subclasses — treat them
+            # all as transient.
             status = CoverStatus.TEMP_ERROR
             error = str(e)
             logging.error(str(e))
-            self.datastore.update(
-                release_mbid=record.release_mbid, caa_id=record.caa_id, new_status=status, error=error
-            )
+            # A failure mid-stream can leave a partial temp file behind
+            try:
+                os.remove(tmp_filepath)
+            except OSError:
+                pass
+            self._queue_update(release_mbid, caa_id, status, error)
             return None, None
 
-        # Retry loop for DB update only (handles transient locks)
-        max_retries = 5
-
         # Verify download against IA metadata if available
         integrity_error = self._verify_after_download(release_mbid, caa_id, filepath, extension)
         if integrity_error:
@@ -259,32 +365,14 @@ class CAADownloader:
             error = f"integrity: {integrity_error}"
             logging.warning(f"Post-download verification failed for {filepath}: {integrity_error}")
 
-        for attempt in range(max_retries):
-            try:
-                self.datastore.update(
-                    release_mbid=record.release_mbid, caa_id=record.caa_id, new_status=status, error=error
-                )
+        self._queue_update(release_mbid, caa_id, status, error)
+        with self.lock:
+            # monotonic() cannot jump backwards on NTP adjustments, so the
+            # rate computed from these deltas is always well-defined
+            self.download_times.append(time.monotonic())
+            self.cycle_downloaded_bytes += downloaded_bytes
 
-                with self.lock:
-                    self.download_times.append(time.time())
-                    self.cycle_downloaded_bytes += downloaded_bytes
-
-                return release_mbid, caa_id
-            except Exception as e:
-                if "database is locked" in str(e).lower():
-                    time.sleep(0.1 * (attempt + 1))
-                else:
-                    logging.error(str(e))
-                    return None, None
-
-        # Max retries exhausted
-        self.datastore.update(
-            release_mbid=record.release_mbid,
-            caa_id=record.caa_id,
-            new_status=CoverStatus.TEMP_ERROR,
-            error="Max retries reached due to database lock.",
-        )
-        return None, None
+        return release_mbid, caa_id
 
     def run_downloader(self):
         """
@@ -320,22 +408,18 @@ class CAADownloader:
                     self.cycle_download_errors = 0
                     start_time = time.time()
                     last_log = start_time
-                    while not self._shutdown_requested:
-                        records_to_download = self.datastore.get_batch(
-                            status=CoverStatus.NOT_DOWNLOADED, count=self.batch_size
-                        )
-
-                        if not records_to_download:
-                            break
 
-                        # Submit download tasks to the thread pool
-                        future_to_record = {
-                            executor.submit(self._download_and_save_record, record): record
-                            for record in records_to_download
-                        }
-
-                        # Process results as they become available
-                        for future in as_completed(future_to_record):
+                    # Keep a bounded window of futures in flight instead of
+                    # submitting a whole batch up front. This caps the memory
+                    # held by pending futures and keeps the pool busy across
+                    # batch boundaries instead of idling at each batch tail.
+                    max_in_flight = 4 * self.download_threads
+                    in_flight = {}  # future -> (release_mbid, caa_id)
+
+                    def process_done(done_futures):
+                        nonlocal last_log
+                        for future in done_futures:
+                            in_flight.pop(future, None)
                             try:
                                 result = future.result()
                                 if result[0] is not None:
@@ -347,15 +431,70 @@ class CAADownloader:
                             except Exception as e:
                                 logging.error(f"A download task generated an exception: {e}")
 
-                            now = time.time()
-                            if now - last_log >= DOWNLOAD_PROGRESS_INTERVAL:
-                                download_rate = self.get_download_rate()
-                                rate_str = f" {download_rate:.2f}/sec " if download_rate > 0 else ""
-                                logging.info(
-                                    f"Downloaded: {self.downloaded} / {total_to_download}"
-                                    f" {rate_str}Errors: {self.errors}"
-                                )
-                                last_log = now
+                        now = time.time()
+                        if now - last_log >= DOWNLOAD_PROGRESS_INTERVAL:
+                            download_rate = self.get_download_rate()
+                            rate_str = f" {download_rate:.2f}/sec " if download_rate > 0 else ""
+                            logging.info(
+                                f"Downloaded: {self.downloaded} / {total_to_download} {rate_str}Errors: {self.errors}"
+                            )
+                            last_log = now
+
+                    # Keyset cursor: key of the last row fetched, so each
+                    # get_batch seeks straight past already-processed rows
+                    # instead of re-scanning the table from the start.
+                    cursor = None
+
+                    while not self._shutdown_requested:
+                        # Apply queued status updates before fetching so that
+                        # completed records are not returned again
+                        self._flush_pending_updates()
+
+                        records_to_download = list(
+                            self.datastore.get_batch(
+                                status=CoverStatus.NOT_DOWNLOADED, count=self.batch_size, after=cursor
+                            )
+                        )
+
+                        if not records_to_download:
+                            if cursor is not None:
+                                # End of this pass; restart from the top to
+                                # pick up rows that were still in flight (or
+                                # failed transiently) when we passed them
+                                cursor = None
+                                continue
+                            if not in_flight:
+                                break
+                            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                            process_done(done)
+                            continue
+
+                        cursor = (records_to_download[-1].release_mbid, records_to_download[-1].caa_id)
+
+                        submitted = 0
+                        pending_keys = set(in_flight.values())
+                        for record in records_to_download:
+                            if self._shutdown_requested:
+                                break
+                            key = (record.release_mbid, record.caa_id)
+                            if key in pending_keys:
+                                # Still in flight from the previous fetch
+                                continue
+                            in_flight[executor.submit(self._download_and_save_record, record)] = key
+                            submitted += 1
+                            if len(in_flight) >= max_in_flight:
+                                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                                process_done(done)
+
+                        if submitted == 0 and in_flight:
+                            # Everything fetched is already in flight; let some finish
+                            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                            process_done(done)
+
+                    # Drain any remaining in-flight downloads
+                    if in_flight:
+                        process_done(as_completed(list(in_flight)))
+                    self._flush_pending_updates()
 
                     logging.info(
                         f"Session complete: {self.cycle_downloaded_files} downloaded,"
@@ -437,6 +576,7 @@ def main():
     monitor = CAAServiceMonitor(downloader=downloader, port=monitor_port)
     monitor.start()
 
+    downloader.warm_connections()
     downloader.run_downloader()
     while not downloader._shutdown_requested:
         cycle_start = time.time()
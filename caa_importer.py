@@ -12,14 +12,16 @@
 
 import logging
 import os
+import queue
 import sys
+import threading
 import time
 
 import click
 import psycopg2
 from dotenv import load_dotenv
 
-from store import CAABackupDataStore, CoverStatus
+from store import CAABackupDataStore
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
@@ -62,35 +64,92 @@ class CAAImporter:
             logging.error(f"PostgreSQL connection error: {e}")
             return None
 
-    def get_caa_records(self, cursor: psycopg2.extensions.cursor, include_date=False):
+    def get_caa_records(self, cursor: psycopg2.extensions.cursor):
         """
         Fetches a batch of CAA records from the PostgreSQL query result.
 
+        Rows are passed through as the driver's raw tuples; bulk_add_rows
+        consumes them directly, so no per-row dict conversion is needed.
+
         Args:
             cursor (psycopg2.extensions.cursor): The cursor to fetch records from.
-            include_date (bool): If True, expects a 4th column (date_uploaded).
 
         Returns:
-            list: A list of dictionaries representing database records.
+            list: A list of (caa_id, release_mbid, mime_type[, date_uploaded]) tuples.
+        """
+        return cursor.fetchmany(self.batch_size)
+
+    def _stream_and_insert(self, cursor, include_date: bool = False, total_records: int = None):
         """
-        records_tuples = cursor.fetchmany(self.batch_size)
-
-        if not records_tuples:
-            return []
-
-        records_dict = []
-        for row in records_tuples:
-            record = {
-                "caa_id": row[0],
-                "release_mbid": row[1],
-                "mime_type": row[2],
-                "status": CoverStatus.NOT_DOWNLOADED,
-            }
+        Drains an executed data cursor into the datastore in batches.
+
+        This is the streaming core shared by the full and incremental
+        imports, so tuning (pipelining, batch sizes, progress throttling)
+        lands in one place. A producer thread owns the cursor and feeds
+        batches through a bounded queue, overlapping the PostgreSQL fetch
+        with the SQLite insert; psycopg2 cursors are not thread-safe, so the
+        cursor never leaves the producer, and the SQLite connection never
+        leaves the calling thread. None marks the end of the stream.
+
+        Args:
+            cursor: An executed psycopg2 cursor yielding import rows.
+            include_date (bool): Whether rows carry date_uploaded as their
+                                 last column; if so its maximum is tracked.
+            total_records (int): Optional (approximate) total for progress logs.
+
+        Returns:
+            tuple: (total_imported, latest_date_uploaded)
+        """
+        batches = queue.Queue(maxsize=4)
+
+        def _producer():
+            try:
+                while True:
+                    records = self.get_caa_records(cursor)
+                    batches.put(records or None)
+                    if not records:
+                        break
+            except Exception:
+                logging.exception("Importer fetch thread failed")
+                batches.put(None)
+
+        producer = threading.Thread(target=_producer, daemon=True)
+        producer.start()
+
+        total_imported = 0
+        latest_date_uploaded = None
+        last_log = time.time()
+        while True:
+            records = batches.get()
+
+            if records is None:
+                break
+
             if include_date:
-                record["date_uploaded"] = row[3]
-            records_dict.append(record)
+                # Track the latest date_uploaded for updating our
+                # timestamp — one C-level max() per batch instead of
+                # two Python branches per row
+                batch_max = max((record[3] for record in records if record[3] is not None), default=None)
+                if batch_max is not None and (latest_date_uploaded is None or batch_max > latest_date_uploaded):
+                    latest_date_uploaded = batch_max
+
+            try:
+                self.datastore.bulk_add_rows(records, include_date=include_date)
+                total_imported += len(records)
+            except Exception as e:
+                logging.error(f"Error adding batch: {e}")
+                # Continue with next batch instead of stopping
+
+            now = time.time()
+            if now - last_log >= IMPORT_PROGRESS_INTERVAL:
+                if total_records is not None:
+                    logging.info(f"Imported: {total_imported} / ~{total_records}")
+                else:
+                    logging.info(f"Imported: {total_imported} new records so far")
+                last_log = now
 
-        return records_dict
+        producer.join()
+        return total_imported, latest_date_uploaded
 
     def run_import(self):
         """
@@ -108,17 +167,21 @@ class CAAImporter:
             return
 
         try:
-            # Use a cursor to get the total count for the progress bar
+            # The total only feeds progress logs, so use the planner's O(1)
+            # row estimate instead of an exact count(*) that would run the
+            # full join before any import work starts.
             with self.pg_conn.cursor() as cursor:
-                count_query = """SELECT count(*)
-                                 FROM cover_art_archive.cover_art caa
-                                 JOIN musicbrainz.release r
-                                   ON caa.release = r.id"""
+                count_query = """SELECT reltuples::bigint
+                                   FROM pg_class
+                                  WHERE oid = 'cover_art_archive.cover_art'::regclass"""
                 cursor.execute(count_query)
                 total_records = cursor.fetchone()[0]
 
-            # Use a new cursor for the main data query
-            with self.pg_conn.cursor() as cursor:
+            # Use a server-side (named) cursor for the main data query so
+            # PostgreSQL streams rows to us in batches instead of the client
+            # buffering the entire multi-million-row result set up front.
+            with self.pg_conn.cursor(name="caa_import") as cursor:
+                cursor.itersize = self.batch_size
                 # The main query to fetch the records, now including mime_type
                 data_query = """SELECT caa.id, r.gid, caa.mime_type
                                  FROM cover_art_archive.cover_art caa
@@ -129,24 +192,7 @@ class CAAImporter:
 
                 # Open the datastore connection once for the entire import process.
                 with self.datastore:
-                    total_imported = 0
-                    start_time = time.time()
-                    last_log = start_time
-                    while True:
-                        # Fetch a batch of records from the cursor
-                        records = self.get_caa_records(cursor)
-
-                        if not records:
-                            break
-
-                        # Use the datastore's `bulk_add` function
-                        self.datastore.bulk_add(records)
-                        total_imported += len(records)
-
-                        now = time.time()
-                        if now - last_log >= IMPORT_PROGRESS_INTERVAL:
-                            logging.info(f"Imported: {total_imported} / {total_records}")
-                            last_log = now
+                    total_imported, _ = self._stream_and_insert(cursor, total_records=total_records)
 
             logging.info(f"Import process complete. Total records imported: {total_imported}")
 
@@ -164,6 +210,7 @@ class CAAImporter:
 
             with self.datastore:
                 CAABackup.create_caa_id_index()
+                CAABackup.create_status_index()
 
         except psycopg2.Error as e:
             logging.error(f"PostgreSQL query error: {e}")
@@ -196,13 +243,28 @@ class CAAImporter:
                 else:
                     logging.info("No previous import found, importing all records...")
 
-                # Build the query with date filter if we have a last import date
+                # Build the query with date filter if we have a last import date.
+                # No pre-count here: counting would run the same expensive
+                # JOIN a second time just to decorate the progress log, which
+                # for a small delta costs more than the import itself.
                 if last_import_date:
-                    count_query = """SELECT count(*)
-                                     FROM cover_art_archive.cover_art caa
-                                     JOIN musicbrainz.release r
-                                       ON caa.release = r.id
-                                     WHERE caa.date_uploaded > %s"""
+                    # The date filter is only O(delta) when the source table
+                    # has an index on date_uploaded — without one every
+                    # incremental run pays a full scan, so say so loudly.
+                    with self.pg_conn.cursor() as cursor:
+                        cursor.execute(
+                            """SELECT 1
+                                 FROM pg_indexes
+                                WHERE schemaname = 'cover_art_archive'
+                                  AND tablename = 'cover_art'
+                                  AND indexdef ILIKE '%%date_uploaded%%'"""
+                        )
+                        if cursor.fetchone() is None:
+                            logging.warning(
+                                "No index on cover_art_archive.cover_art(date_uploaded); "
+                                "incremental imports will seq-scan the table. Consider: "
+                                "CREATE INDEX CONCURRENTLY ON cover_art_archive.cover_art (date_uploaded)"
+                            )
 
                     data_query = """SELECT caa.id, r.gid, caa.mime_type, caa.date_uploaded
                                      FROM cover_art_archive.cover_art caa
@@ -213,11 +275,6 @@ class CAAImporter:
                     query_params = (last_import_date,)
                 else:
                     # If no previous import, fetch all records
-                    count_query = """SELECT count(*)
-                                     FROM cover_art_archive.cover_art caa
-                                     JOIN musicbrainz.release r
-                                       ON caa.release = r.id"""
-
                     data_query = """SELECT caa.id, r.gid, caa.mime_type, caa.date_uploaded
                                      FROM cover_art_archive.cover_art caa
                                      JOIN musicbrainz.release r
@@ -225,60 +282,24 @@ class CAAImporter:
                                      ORDER BY caa.date_uploaded"""
                     query_params = ()
 
-                # Use a cursor to get the total count for the progress bar
-                with self.pg_conn.cursor() as cursor:
-                    cursor.execute(count_query, query_params)
-                    total_records = cursor.fetchone()[0]
-
-                if total_records == 0:
-                    logging.info("No new records found to import.")
-                    return
+                # Use a server-side (named) cursor so new rows stream in batches
+                with self.pg_conn.cursor(name="caa_import_incremental") as cursor:
+                    cursor.itersize = self.batch_size
+                    cursor.execute(data_query, query_params)
 
-                logging.info(f"Found {total_records:,} new records to import.")
+                    total_imported, latest_date_uploaded = self._stream_and_insert(cursor, include_date=True)
 
-                # Use a new cursor for the main data query
-                with self.pg_conn.cursor() as cursor:
-                    cursor.execute(data_query, query_params)
+                    if total_imported == 0:
+                        logging.info("No new records found to import.")
 
-                    total_imported = 0
-                    latest_date_uploaded = None
-                    start_time = time.time()
-                    last_log = start_time
-                    while True:
-                        # Fetch a batch of records from the cursor
-                        records = self.get_caa_records(cursor, include_date=True)
-
-                        if not records:
-                            break
-
-                        # Track the latest date_uploaded for updating our timestamp
-                        for record in records:
-                            if record["date_uploaded"]:
-                                if latest_date_uploaded is None or record["date_uploaded"] > latest_date_uploaded:
-                                    latest_date_uploaded = record["date_uploaded"]
-
-                        # Use the datastore's `bulk_add` function
-                        try:
-                            self.datastore.bulk_add(records)
-                            total_imported += len(records)
-                        except Exception as e:
-                            logging.error(f"Error adding batch: {e}")
-                            # Continue with next batch instead of stopping
-
-                        now = time.time()
-                        if now - last_log >= IMPORT_PROGRESS_INTERVAL:
-                            logging.info(f"Imported: {total_imported} / {total_records}")
-                            last_log = now
-
-                    # Always update the timestamp after a successful query,
-                    # even if no records were inserted (e.g. all duplicates).
-                    # This prevents re-querying the same records every cycle.
-                    latest_ts = self.datastore.fetch_latest_date_uploaded(self.pg_conn)
-                    if latest_ts:
-                        self.datastore.update_import_timestamp(latest_ts)
-                        logging.info(f"Updated import timestamp to: {latest_ts}")
-                    else:
-                        logging.warning("Could not fetch latest date_uploaded from Postgres.")
+                    # Advance the timestamp from the rows we just streamed —
+                    # every new date_uploaded passed through this loop, so a
+                    # second MAX() aggregate over the whole table is wasted
+                    # work. This still runs when all rows were duplicates,
+                    # so the same delta isn't re-queried every cycle.
+                    if latest_date_uploaded:
+                        self.datastore.update_import_timestamp(latest_date_uploaded)
+                        logging.info(f"Updated import timestamp to: {latest_date_uploaded}")
                     logging.info(f"Incremental import complete. New records imported: {total_imported}")
 
         except psycopg2.Error as e:
@@ -340,7 +361,7 @@ def main(incremental):
         click.echo("Error: DB_PATH environment variable is not set.", err=True)
         return
 
-    importer = CAAImporter(pg_conn_string=pg_conn_string, db_path=db_path, batch_size=1000)
+    importer = CAAImporter(pg_conn_string=pg_conn_string, db_path=db_path)
 
     if incremental:
         importer.run_import_incremental()
@@ -6,6 +6,7 @@ import json
 import logging
 import socketserver
 import threading
+import time
 
 # Define a default port for the web server to listen on.
 DEFAULT_PORT = 8000
@@ -20,9 +21,17 @@ class CustomThreadingTCPServer(socketserver.ThreadingTCPServer):
     """
 
     allow_reuse_address = True
+    # Per-request threads must not keep the process alive during shutdown
+    # (this matches what http.server.ThreadingHTTPServer sets).
+    daemon_threads = True
 
     def __init__(self, server_address, RequestHandlerClass, downloader, bind_and_activate=True):
         self.downloader = downloader
+        # (encoded_at, body) cache for /status so concurrent scrapers share
+        # one stats() call per TTL window instead of each taking the
+        # downloader's lock.
+        self._status_cache = (float("-inf"), b"")
+        self._status_cache_lock = threading.Lock()
         super().__init__(server_address, RequestHandlerClass, bind_and_activate)
 
 
@@ -33,11 +42,46 @@ class CAAServiceMonitorHandler(http.server.BaseHTTPRequestHandler):
     A custom HTTP request handler for the CAAServiceMonitor web server.
     """
 
+    # How long an encoded /status body stays fresh (seconds)
+    STATUS_TTL = 1.0
+
+    # The complete 404 response, status line and headers included, built
+    # once at class load so the miss path is a single socket write with no
+    # per-request header formatting.
+    _NOT_FOUND_BODY = b"404 Not Found"
+    RESP_404 = (
+        b"HTTP/1.0 404 Not Found\r\n"
+        b"Content-Type: text/plain\r\n"
+        b"Content-Length: " + str(len(_NOT_FOUND_BODY)).encode("ascii") + b"\r\n"
+        b"\r\n" + _NOT_FOUND_BODY
+    )
+
     # Override the log_message method to prevent the server from printing
     # a line for each request.
     def log_message(self, format, *args):
         pass
 
+    def _status_body(self):
+        """
+        Return the JSON-encoded stats, re-encoding at most once per STATUS_TTL.
+
+        A scrape storm then costs one stats() call (and one json.dumps) per
+        second in total, rather than one per request.
+        """
+        server = self.server
+        encoded_at, body = server._status_cache
+        if time.monotonic() - encoded_at < self.STATUS_TTL:
+            return body
+        with server._status_cache_lock:
+            # Another request may have refreshed the cache while we waited
+            encoded_at, body = server._status_cache
+            now = time.monotonic()
+            if now - encoded_at < self.STATUS_TTL:
+                return body
+            body = json.dumps(server.downloader.stats()).encode("utf-8")
+            server._status_cache = (now, body)
+            return body
+
     def do_GET(self):
         """
         Handle GET requests. This method is called by the server for every GET request.
@@ -45,36 +89,34 @@ class CAAServiceMonitorHandler(http.server.BaseHTTPRequestHandler):
         # Check if the requested path is '/status'.
         if self.path == "/status":
             try:
-                # Access the downloader instance through the server object.
-                response_data = self.server.downloader.stats()
+                response_bytes = self._status_body()
                 # Respond with a 200 OK status code.
                 self.send_response(200)
 
             except AttributeError:
                 # If the downloader or stats() method is not found, return an error.
                 self.send_response(500)
-                response_data = {"error": "Downloader instance or stats() method is not available."}
+                error = {"error": "Downloader instance or stats() method is not available."}
+                response_bytes = json.dumps(error).encode("utf-8")
             except Exception as e:
                 # Catch any other exceptions during the stats call.
                 self.send_response(500)
-                response_data = {"error": f"An error occurred while getting stats: {str(e)}"}
+                error = {"error": f"An error occurred while getting stats: {str(e)}"}
+                response_bytes = json.dumps(error).encode("utf-8")
 
             # Set the Content-type header to 'application/json' so the client knows
             # to expect JSON data.
             self.send_header("Content-type", "application/json")
             self.end_headers()
 
-            # Convert the Python dictionary to a JSON string and encode it to bytes.
-            response_bytes = json.dumps(response_data, indent=4).encode("utf-8")
             # Write the response to the client.
             self.wfile.write(response_bytes)
 
         else:
-            # If the path is not '/status', respond with a 404 Not Found error.
-            self.send_response(404)
-            self.send_header("Content-type", "text/plain")
-            self.end_headers()
-            self.wfile.write(b"404 Not Found")
+            # If the path is not '/status', respond with the precomputed
+            # 404 response in one write.
+            self.wfile.write(self.RESP_404)
+            self.close_connection = True
 
 
 # The main class that runs the web server in a separate thread.
@@ -7,7 +7,10 @@
 
 import logging
 import os
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import click
 from dotenv import load_dotenv
@@ -40,40 +43,133 @@ class CAAVerifier:
         self.datastore = CAABackupDataStore(db_path=db_path)
         self.images_dir = images_dir
 
-    def _scan_and_update(self, batch_size: int = 1000):
+    def _iter_files(self, path: str):
         """
-        Scans the images directory and updates the database in streaming batches.
-        Avoids building a full list of all caa_ids in memory.
+        Yields filenames under `path` recursively using os.scandir.
+
+        os.walk stats every entry to classify it; DirEntry reuses the d_type
+        readdir already returned, roughly halving syscalls over a
+        multi-million-file images tree.
+        """
+        try:
+            entries = os.scandir(path)
+        except OSError as err:
+            logging.warning(f"Cannot scan {path}: {err}")
+            return
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._iter_files(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.name
+
+    def _scan_shard(self, path: str, out_q: queue.Queue, batch_size: int, stop: threading.Event):
+        """
+        Scans one shard directory, pushing caa_ids into `out_q` in chunks
+        of at most `batch_size`, followed by a None sentinel. Returns the
+        number of files seen.
+
+        Chunking here (rather than returning the whole shard's IDs at
+        once) keeps peak memory at a few in-flight chunks regardless of
+        shard size — the queue's maxsize backpressures the scan threads
+        if the database updates fall behind. `stop` is set when the
+        consumer has failed and is no longer draining; checking it keeps
+        this thread from scanning (and blocking on put) for nothing.
+        """
+        caa_ids = []
+        files_seen = 0
+        try:
+            for file in self._iter_files(path):
+                if stop.is_set():
+                    break
+                files_seen += 1
+                parsed = parse_local_filename(file)
+                if parsed:
+                    caa_ids.append(parsed["caa_id"])
+                    if len(caa_ids) >= batch_size:
+                        out_q.put(caa_ids)
+                        caa_ids = []
+            if caa_ids and not stop.is_set():
+                out_q.put(caa_ids)
+        finally:
+            # Always deliver the sentinel so the consumer never hangs on a
+            # shard that failed mid-scan
+            out_q.put(None)
+        return files_seen
+
+    def _scan_and_update(self, batch_size: int = 1000, scan_threads: int = 8):
+        """
+        Scans the images directory and updates the database in batches.
+
+        The top-level prefix shards are scanned in parallel — readdir
+        releases the GIL, so threads overlap directory I/O well. The scan
+        threads hand their IDs over in fixed-size chunks through a bounded
+        queue, so peak memory stays O(batch_size x queue depth) no matter
+        how large the tree is. Database updates stay on this thread, since
+        the SQLite connection must not be shared across threads.
         """
         logging.info("Scanning local images directory for files...")
-        batch = []
         processed = 0
         updated = 0
         last_log = time.time()
 
-        for root, _, files in os.walk(self.images_dir):
-            for file in files:
-                parsed = parse_local_filename(file)
-                if parsed:
-                    batch.append(parsed["caa_id"])
+        shards = []
+        batch = []
+        try:
+            with os.scandir(self.images_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        shards.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        # Files directly in images_dir (DIR_DEPTH=0 layouts)
+                        processed += 1
+                        parsed = parse_local_filename(entry.name)
+                        if parsed:
+                            batch.append(parsed["caa_id"])
+                            if len(batch) >= batch_size:
+                                self.datastore.bulk_update_downloaded_status(batch)
+                                updated += len(batch)
+                                batch = []
+        except OSError as err:
+            logging.warning(f"Cannot scan {self.images_dir}: {err}")
+            return 0
 
-                processed += 1
+        if batch:
+            self.datastore.bulk_update_downloaded_status(batch)
+            updated += len(batch)
 
-                if len(batch) >= batch_size:
-                    self.datastore.bulk_update_downloaded_status(batch)
-                    updated += len(batch)
-                    batch = []
+        stop = threading.Event()
+        out_q: queue.Queue = queue.Queue(maxsize=scan_threads * 2)
+        with ThreadPoolExecutor(max_workers=max(1, min(scan_threads, len(shards)))) as executor:
+            futures = [executor.submit(self._scan_shard, shard, out_q, batch_size, stop) for shard in shards]
+            finished = 0
+            try:
+                while finished < len(futures):
+                    chunk = out_q.get()
+                    if chunk is None:
+                        finished += 1
+                        continue
+                    self.datastore.bulk_update_downloaded_status(chunk)
+                    updated += len(chunk)
 
-                if processed % 10000 == 0:
                     now = time.time()
                     if now - last_log >= VERIFY_PROGRESS_INTERVAL:
-                        logging.info(f"Scanned {processed} files, updated {updated} records...")
+                        logging.info(f"Updated {updated} records...")
                         last_log = now
-
-        # Flush remaining batch
-        if batch:
-            self.datastore.bulk_update_downloaded_status(batch)
-            updated += len(batch)
+            except BaseException:
+                # A database failure here (anything _retry_on_locked
+                # re-raises) must not turn into a hang: workers may be
+                # blocked in put() on the full queue, and the executor's
+                # shutdown below would wait on them forever. Tell them to
+                # stop, drain until every sentinel has arrived, then
+                # surface the original error.
+                stop.set()
+                while finished < len(futures):
+                    if out_q.get() is None:
+                        finished += 1
+                raise
+            for future in futures:
+                processed += future.result()
 
         logging.info(f"Finished scanning. Files processed: {processed}, records updated: {updated}")
         return updated
@@ -86,26 +182,37 @@ class CAAVerifier:
         logging.info("Starting cache verification process...")
 
         with self.datastore:
-            # Step 1: Mark all records in the database as NOT_DOWNLOADED.
-            logging.info("Resetting all records to 'NOT_DOWNLOADED' status...")
-            self.datastore.mark_all_as_undownloaded()
-
-            # Step 2: Scan files and update DB in streaming batches.
-            self._scan_and_update()
-
-        self._print_summary()
+            # The verify pass rewrites nearly every row, so drop the fsync
+            # per commit for its duration. If the process dies mid-way the
+            # database is rebuilt by simply re-running the verifier, which
+            # makes the durability trade safe here. The datastore's default
+            # (NORMAL under WAL) is restored before normal operation resumes.
+            self.datastore.db.execute_sql("PRAGMA synchronous=OFF")
+            try:
+                # Step 1: Mark all records in the database as NOT_DOWNLOADED.
+                logging.info("Resetting all records to 'NOT_DOWNLOADED' status...")
+                self.datastore.mark_all_as_undownloaded()
+
+                # Step 2: Scan files and update DB in streaming batches.
+                self._scan_and_update()
+            finally:
+                self.datastore.db.execute_sql("PRAGMA synchronous=NORMAL")
+
+            # Summarize on the same connection while its page cache is
+            # still warm from the update pass.
+            self._print_summary()
         logging.info("Verification complete.")
 
     def _print_summary(self):
         """
         Private method to fetch and print a summary of the download statuses.
+        Assumes the datastore connection is already open.
         """
-        with self.datastore:
-            logging.info("--- Verification Summary ---")
-            status_counts = self.datastore.get_status_counts()
-            for status, count in status_counts.items():
-                logging.info(f"- {status.replace('_', ' ').title()}: {count}")
-            logging.info("----------------------------")
+        logging.info("--- Verification Summary ---")
+        status_counts = self.datastore.get_status_counts()
+        for status, count in status_counts.items():
+            logging.info(f"- {status.replace('_', ' ').title()}: {count}")
+        logging.info("----------------------------")
 
 
 # -----------------------------------------------------------------------------
@@ -40,6 +40,16 @@ def parse_ia_filename(filename: str) -> dict | None:
     return {"release_mbid": m.group("release_mbid"), "caa_id": int(m.group("caa_id")), "ext": m.group("ext")}
 
 
+# Common cover-art MIME types mapped once; extension_from_mime runs on the
+# per-image hot path, so avoid splitting the string for the usual cases.
+_MIME_EXT = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "image/webp": "webp",
+}
+
+
 def extension_from_mime(mime_type: str | None) -> str:
     """Return file extension for a given MIME type.
 
@@ -52,9 +62,7 @@ def extension_from_mime(mime_type: str | None) -> str:
     """
     if not mime_type:
         return "jpg"
-    if mime_type == "image/jpeg":
-        return "jpg"
-    return mime_type.split("/")[-1]
+    return _MIME_EXT.get(mime_type) or mime_type.rpartition("/")[2]
 
 
 def build_download_url(release_mbid: str, caa_id: int, extension: str) -> str:
@@ -107,6 +115,26 @@ def build_image_path(images_dir: str, release_mbid: str, caa_id: int, extension:
     return os.path.join(release_dir(images_dir, release_mbid), filename)
 
 
+def count_files(path: str) -> int:
+    """Count regular files under a directory recursively.
+
+    Uses os.scandir so entries are classified from the d_type readdir
+    already returned, instead of os.walk's extra stat per entry.
+    """
+    total = 0
+    try:
+        entries = os.scandir(path)
+    except OSError:
+        return 0
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                total += count_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                total += 1
+    return total
+
+
 def migrate_release_files(images_dir: str, release_mbid: str, filename: str, src_path: str, new_depth: int) -> bool:
     """Move a file to the correct directory for the given depth.
 
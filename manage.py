@@ -282,9 +282,9 @@ def status():
         if os.path.exists(images_dir):
             click.echo("✓ Images directory exists")
             # Count files in images directory
-            file_count = 0
-            for root, dirs, files in os.walk(images_dir):
-                file_count += len(files)
+            from helpers import count_files
+
+            file_count = count_files(images_dir)
             click.echo(f"  Files in directory: {file_count:,}")
         else:
             click.echo("✗ Images directory does not exist")
@@ -294,7 +294,9 @@ def status():
         try:
             from store import CAABackupDataStore
 
-            with CAABackupDataStore(db_path) as datastore:
+            # Read-only: the status command must not contend with a
+            # downloader that may be writing to the same database.
+            with CAABackupDataStore(db_path, read_only=True) as datastore:
                 click.echo("\n=== Database Statistics ===")
 
                 # Show last import timestamp
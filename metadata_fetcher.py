@@ -20,6 +20,9 @@ from helpers import USER_AGENT, parse_ia_filename, release_dir
 
 IA_METADATA_URL = "https://archive.org/metadata/mbid-{release_mbid}/files"
 
+# Built once; fetch_and_save_metadata runs for millions of releases
+_HEADERS = {"User-Agent": USER_AGENT}
+
 
 def metadata_path(images_dir: str, release_mbid: str) -> str:
     """Return the path where metadata for a release should be stored."""
@@ -35,7 +38,7 @@ def fetch_and_save_metadata(images_dir: str, release_mbid: str, timeout: int = 3
     dest = metadata_path(images_dir, release_mbid)
 
     try:
-        response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=timeout)
+        response = requests.get(url, headers=_HEADERS, timeout=timeout)
         response.raise_for_status()
 
         # Validate it's valid JSON with expected structure
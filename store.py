@@ -6,6 +6,7 @@
 # retaining the original function signatures and class names.
 
 import enum
+import functools
 import logging
 import time
 from typing import List
@@ -16,6 +17,28 @@ import peewee
 DB_RETRY_DELAY_SECONDS = 1
 
 
+def _retry_on_locked(fn):
+    """
+    Retries a datastore method while SQLite reports "database is locked".
+
+    The connection's busy_timeout already makes SQLite wait out short lock
+    windows in C; this is the fallback for locks held longer than that.
+    Every retryable method used to carry its own copy of this loop.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except peewee.OperationalError as err:
+                if "database is locked" not in str(err):
+                    raise
+                time.sleep(DB_RETRY_DELAY_SECONDS)
+
+    return wrapper
+
+
 # -----------------------------------------------------------------------------
 # Define the Enum for the record status.
 # -----------------------------------------------------------------------------
@@ -26,6 +49,11 @@ class CoverStatus(enum.Enum):
     PERMANENT_ERROR = 3
 
 
+# Enum attribute access goes through a descriptor; on per-row hot loops a
+# plain dict lookup is measurably cheaper.
+_STATUS_VALUE = {status: status.value for status in CoverStatus}
+
+
 # -----------------------------------------------------------------------------
 # Define the PeeWee Model for our table.
 # -----------------------------------------------------------------------------
@@ -113,6 +141,28 @@ class CAABackup(peewee.Model):
             logging.error(f"Error creating unique index on caa_id: {e}")
             raise
 
+    @classmethod
+    def create_status_index(cls):
+        """
+        Creates a covering index on (status, release_mbid, caa_id) so that
+        get_batch's keyset pagination is a pure index seek. Like the caa_id
+        index, this is created after the bulk import is complete to avoid
+        index-maintenance overhead during the initial inserts.
+        """
+        try:
+            with db.atomic():
+                logging.info("Creating status index...")
+
+                db.execute_sql(
+                    "CREATE INDEX IF NOT EXISTS idx_caa_backup_status_key ON caa_backup (status, release_mbid, caa_id)"
+                )
+
+                logging.info("Status index created successfully")
+
+        except Exception as e:
+            logging.error(f"Error creating status index: {e}")
+            raise
+
 
 class ImportTimestamp(peewee.Model):
     """
@@ -139,14 +189,40 @@ class CAABackupDataStore:
     A simple data store for managing CAA backup statuses using PeeWee.
     """
 
-    def __init__(self, db_path="caa_backup.db"):
+    def __init__(self, db_path="caa_backup.db", read_only=False):
         """
         Initializes the data store.
 
         Args:
             db_path (str): The path to the SQLite database file.
+            read_only (bool): Open the database read-only. Read-only
+                              connections never take the write lock, so
+                              status/summary queries cannot stall (or be
+                              stalled by) a running downloader.
         """
-        self.db = peewee.SqliteDatabase(db_path, pragmas={"journal_mode": "wal"})
+        # WAL lets readers proceed while the downloader writes; NORMAL sync
+        # is durable enough under WAL and skips an fsync per commit. The
+        # busy_timeout makes SQLite wait out short lock windows in C instead
+        # of surfacing "database is locked" to Python. Applied on every
+        # (re)connect since these are per-connection settings.
+        pragmas = {
+            "journal_mode": "wal",
+            "synchronous": "normal",
+            "busy_timeout": 30000,
+            "temp_store": "memory",
+            "cache_size": -65536,
+            "mmap_size": 268435456,
+        }
+        if read_only:
+            # A read-only connection cannot switch journal modes and has no
+            # commits to sync; keep only the lookup-side pragmas.
+            db_path = f"file:{db_path}?mode=ro"
+            pragmas = {
+                "busy_timeout": 30000,
+                "cache_size": -65536,
+                "mmap_size": 268435456,
+            }
+        self.db = peewee.SqliteDatabase(db_path, pragmas=pragmas, uri=read_only)
         db.initialize(self.db)
         self.model = CAABackup
 
@@ -169,8 +245,13 @@ class CAABackupDataStore:
         """
         Connects to the database and creates the tables if they do not exist.
         """
+        opened = False
         try:
-            self.db.connect(reuse_if_open=True)
+            # connect() returns True only when it opened a new connection;
+            # when create() runs inside an already-open context we must not
+            # close the caller's connection (and throw away its per-
+            # connection pragmas) on the way out.
+            opened = self.db.connect(reuse_if_open=True)
             # Create the main backup table
             if not self.model.table_exists():
                 logging.info("Creating table 'caa_backup'...")
@@ -186,7 +267,8 @@ class CAABackupDataStore:
         except peewee.OperationalError as e:
             logging.error(f"Database error: {e}")
         finally:
-            self.db.close()
+            if opened:
+                self.db.close()
 
     def bulk_add(self, records: list):
         """
@@ -206,7 +288,7 @@ class CAABackupDataStore:
             {
                 "caa_id": r["caa_id"],
                 "release_mbid": r["release_mbid"],
-                "status": r["status"].value,
+                "status": _STATUS_VALUE[r["status"]],
                 "mime_type": r["mime_type"],
                 "date_uploaded": r.get("date_uploaded"),
                 "error": r.get("error"),
@@ -214,68 +296,138 @@ class CAABackupDataStore:
             for r in records
         ]
 
-        try:
-            with self.db.atomic():
-                self.model.insert_many(records_for_db).execute()
-        except peewee.IntegrityError:
-            logging.error("Error: One or more records in the list already exist.")
+        with self.db.atomic():
+            # Chunk so each INSERT stays under SQLite's bound-variable
+            # limit (999 in older builds); all chunks still commit as
+            # one transaction. Duplicates are skipped row-by-row instead
+            # of aborting the whole batch.
+            for chunk in peewee.chunked(records_for_db, 999 // 6):
+                self.model.insert_many(chunk).on_conflict_ignore().execute()
 
+    def bulk_add_rows(self, rows: list, include_date: bool = False):
+        """
+        Adds rows fetched straight from the source database in a single
+        transaction, without building a dict per row — on multi-million-row
+        imports that per-row conversion costs more than the insert itself.
+        All rows are inserted with NOT_DOWNLOADED status.
+
+        Args:
+            rows (list): Tuples of (caa_id, release_mbid, mime_type), plus a
+                         trailing date_uploaded when include_date is True.
+            include_date (bool): Whether rows carry a date_uploaded column.
+        """
+        if not rows:
+            logging.info("No records to add.")
+            return
+
+        fields = [self.model.caa_id, self.model.release_mbid, self.model.mime_type]
+        if include_date:
+            fields.append(self.model.date_uploaded)
+        fields.append(self.model.status)
+
+        status = CoverStatus.NOT_DOWNLOADED.value
+        rows_for_db = [(*row, status) for row in rows]
+
+        with self.db.atomic():
+            # Same chunking and conflict handling as bulk_add: keep each
+            # INSERT under the bound-variable limit, commit once per call,
+            # and skip duplicates without aborting the batch.
+            for chunk in peewee.chunked(rows_for_db, 999 // len(fields)):
+                self.model.insert_many(chunk, fields=fields).on_conflict_ignore().execute()
+
+    @_retry_on_locked
     def get(self, caa_id: int):
         """Retrieves a single record by its CAA ID."""
-        while True:
-            try:
-                return self.model.get_or_none(self.model.caa_id == caa_id)
-            except peewee.OperationalError as err:
-                if "database is locked" in str(err):
-                    time.sleep(DB_RETRY_DELAY_SECONDS)
-                    continue
-                raise
+        return self.model.get_or_none(self.model.caa_id == caa_id)
+
+    @_retry_on_locked
+    def get_status(self, caa_id: int):
+        """
+        Retrieves just (status, mime_type) for a record, or None.
 
-    def get_batch(self, status: CoverStatus = CoverStatus.NOT_DOWNLOADED, count: int = 100):
+        get() materializes a full model instance including the error TEXT
+        column; callers that only need the status should use this instead.
+        """
+        cursor = self.db.execute_sql(
+            "SELECT status, mime_type FROM caa_backup WHERE caa_id = ?",
+            (caa_id,),
+        )
+        return cursor.fetchone()
+
+    @_retry_on_locked
+    def get_batch(self, status: CoverStatus = CoverStatus.NOT_DOWNLOADED, count: int = 100, after: tuple = None):
         """
         Retrieves a batch of up to `count` records with the specified status.
 
         Args:
             status (CoverStatus): The status to filter by. Defaults to NOT_DOWNLOADED.
             count (int): The maximum number of records to retrieve.
+            after (tuple): Optional (release_mbid, caa_id) key of the last
+                           record of the previous batch. When given, only
+                           records after that key are returned (keyset
+                           pagination), so successive calls seek straight to
+                           new rows instead of re-scanning processed ones.
+
+        Rows are returned as namedtuples of (release_mbid, caa_id, mime_type);
+        building full model instances is needless overhead on the hot path.
         """
-        while True:
-            try:
-                return (
-                    self.model.select()
-                    .where(self.model.status == status.value)
-                    .order_by(self.model.release_mbid)
-                    .limit(count)
-                )
-            except peewee.OperationalError as err:
-                if "database is locked" in str(err):
-                    time.sleep(DB_RETRY_DELAY_SECONDS)
-                    continue
-                raise
-
+        condition = self.model.status == status.value
+        if after is not None:
+            condition &= peewee.Tuple(self.model.release_mbid, self.model.caa_id) > after
+        return (
+            self.model.select(self.model.release_mbid, self.model.caa_id, self.model.mime_type)
+            .where(condition)
+            .order_by(self.model.release_mbid, self.model.caa_id)
+            .limit(count)
+            .namedtuples()
+        )
+
+    @_retry_on_locked
     def update(self, caa_id: int, release_mbid: str, new_status: CoverStatus, error: str = None):
-        """Updates the status and error for a specific record."""
-        while True:
-            try:
-                record = self.model.get((self.model.caa_id == caa_id) & (self.model.release_mbid == release_mbid))
-                record.status = new_status.value
-                record.release_mbid = release_mbid
-                record.error = error
-                record.save()
-                return
-            except self.model.DoesNotExist:
-                logging.error(f"Error: Record with CAA ID {caa_id} not found.")
-                return
-            except peewee.OperationalError as err:
-                if "database is locked" in str(err):
-                    time.sleep(DB_RETRY_DELAY_SECONDS)
-                    continue
-                raise err
+        """Updates the status and error for a specific record.
+
+        Issues a single UPDATE rather than a SELECT followed by save(),
+        halving the statements on a frequently-called path.
+        """
+        updated = (
+            self.model.update(status=new_status.value, error=error)
+            .where((self.model.caa_id == caa_id) & (self.model.release_mbid == release_mbid))
+            .execute()
+        )
+        if updated == 0:
+            logging.error(f"Error: Record with CAA ID {caa_id} not found.")
+
+    @_retry_on_locked
+    def bulk_update_status(self, updates: list):
+        """
+        Applies a batch of status updates in a single transaction.
+
+        One transaction (and therefore one fsync) per batch instead of one
+        per record keeps SQLite's writer lock contention to a minimum.
 
+        Args:
+            updates (list): Tuples of (release_mbid, caa_id, status, error),
+                            where status is a CoverStatus enum member.
+        """
+        if not updates:
+            return
+
+        rows = [(_STATUS_VALUE[status], error, release_mbid, caa_id) for release_mbid, caa_id, status, error in updates]
+        with self.db.atomic():
+            self.db.cursor().executemany(
+                "UPDATE caa_backup SET status = ?, error = ? WHERE release_mbid = ? AND caa_id = ?",
+                rows,
+            )
+
+    @_retry_on_locked
     def bulk_update_downloaded_status(self, caa_ids: List[int]):
         """
         Updates the status to 'DOWNLOADED' for a list of CAA IDs.
-        This is done in a single, efficient query.
+
+        The IDs are staged into a per-connection temp table and applied with
+        one UPDATE, so the whole batch costs a single commit and one indexed
+        subquery instead of an ever-growing IN (...) literal that SQLite
+        would have to re-parse per call.
 
         Args:
             caa_ids (List[int]): A list of caa_ids to update.
@@ -283,117 +435,123 @@ class CAABackupDataStore:
         if not caa_ids:
             return
 
-        while True:
-            try:
-                with self.db.atomic():
-                    self.model.update(status=CoverStatus.DOWNLOADED.value).where(
-                        self.model.caa_id.in_(caa_ids)
-                    ).execute()
-                return
-            except peewee.OperationalError as err:
-                if "database is locked" in str(err):
-                    time.sleep(DB_RETRY_DELAY_SECONDS)
-                    continue
-                raise err
-
+        with self.db.atomic():
+            self.db.execute_sql("CREATE TEMP TABLE IF NOT EXISTS tmp_found_caa_ids (caa_id INTEGER PRIMARY KEY)")
+            self.db.execute_sql("DELETE FROM tmp_found_caa_ids")
+            self.db.cursor().executemany(
+                "INSERT OR IGNORE INTO tmp_found_caa_ids VALUES (?)",
+                ((caa_id,) for caa_id in caa_ids),
+            )
+            self.db.execute_sql(
+                "UPDATE caa_backup SET status = ? WHERE caa_id IN (SELECT caa_id FROM tmp_found_caa_ids)",
+                (CoverStatus.DOWNLOADED.value,),
+            )
+
+    # How many rows each mark_all_as_undownloaded transaction touches
+    RESET_CHUNK_SIZE = 10000
+
+    @_retry_on_locked
     def mark_all_as_undownloaded(self):
         """
         Marks all records in the database as 'NOT_DOWNLOADED'.
-        This is a single, efficient query.
+
+        Done in bounded chunks, each its own transaction: a single
+        table-wide UPDATE over millions of rows holds the write lock (and
+        builds WAL frames) for the whole statement, stalling every reader
+        until it finishes. The chunks walk the rowid B-tree behind a
+        watermark, so each one is an incremental seek rather than a rescan
+        past the already-reset prefix; rows already at NOT_DOWNLOADED are
+        left untouched.
         """
+        not_downloaded = CoverStatus.NOT_DOWNLOADED.value
+        last_rowid = 0
         while True:
-            try:
-                with self.db.atomic():
-                    self.model.update(status=CoverStatus.NOT_DOWNLOADED.value).execute()
-                return
-            except peewee.OperationalError as err:
-                if "database is locked" in str(err):
-                    time.sleep(DB_RETRY_DELAY_SECONDS)
-                    continue
-                raise err
+            with self.db.atomic():
+                upper = self.db.execute_sql(
+                    "SELECT MAX(rowid) FROM (SELECT rowid FROM caa_backup WHERE rowid > ? ORDER BY rowid LIMIT ?)",
+                    (last_rowid, self.RESET_CHUNK_SIZE),
+                ).fetchone()[0]
+                if upper is None:
+                    return
+                self.db.execute_sql(
+                    "UPDATE caa_backup SET status = ? WHERE rowid > ? AND rowid <= ? AND status != ?",
+                    (not_downloaded, last_rowid, upper, not_downloaded),
+                )
+            last_rowid = upper
 
+    @_retry_on_locked
     def get_failed(self):
-        """Retrieves all records with a 'failed' status."""
-        while True:
-            try:
-                # We need to query for both temporary and permanent errors
-                return self.model.select().where(
-                    (self.model.status == CoverStatus.TEMP_ERROR.value)
-                    | (self.model.status == CoverStatus.PERMANENT_ERROR.value)
-                )
-            except peewee.OperationalError as err:
-                if "database is locked" in str(err):
-                    time.sleep(DB_RETRY_DELAY_SECONDS)
-                    continue
-                raise
+        """
+        Retrieves all records with a 'failed' status.
 
+        Returned as an iterator so long failure lists stream out of the
+        cursor row by row instead of being cached in memory by peewee.
+        """
+        # We need to query for both temporary and permanent errors
+        return (
+            self.model.select()
+            .where(
+                (self.model.status == CoverStatus.TEMP_ERROR.value)
+                | (self.model.status == CoverStatus.PERMANENT_ERROR.value)
+            )
+            .iterator()
+        )
+
+    @_retry_on_locked
     def get_undownloaded_count(self):
         """
         Retrieves the total count of records that have not been downloaded.
         """
-        while True:
-            try:
-                return self.model.select().where(self.model.status == CoverStatus.NOT_DOWNLOADED.value).count()
-            except peewee.OperationalError as err:
-                if "database is locked" in str(err):
-                    time.sleep(DB_RETRY_DELAY_SECONDS)
-                    continue
-                raise err
+        return self.model.select().where(self.model.status == CoverStatus.NOT_DOWNLOADED.value).count()
 
+    @_retry_on_locked
+    def has_undownloaded(self):
+        """
+        Returns True if any record is still NOT_DOWNLOADED.
+
+        A single index seek, for callers that only need to decide whether
+        there is work left — counting all matching rows walks the whole
+        index range.
+        """
+        cursor = self.db.execute_sql(
+            "SELECT 1 FROM caa_backup WHERE status = ? LIMIT 1",
+            (CoverStatus.NOT_DOWNLOADED.value,),
+        )
+        return cursor.fetchone() is not None
+
+    @_retry_on_locked
     def get_status_counts(self):
         """
-        Retrieves the count of records for each status.
+        Retrieves the count of records for each status using a single
+        GROUP BY query, rather than one scan per status value.
         Returns:
-            dict: A dictionary with CoverStatus enum members as keys and their counts as values.
-        """
-        counts = {}
-        for status_enum in CoverStatus:
-            while True:
-                try:
-                    count = self.model.select().where(self.model.status == status_enum.value).count()
-                    counts[status_enum.name] = count
-                    break
-                except peewee.OperationalError as err:
-                    if "database is locked" in str(err):
-                        time.sleep(DB_RETRY_DELAY_SECONDS)
-                        continue
-                    raise err
-        return counts
+            dict: A dictionary with CoverStatus names as keys and their counts as values.
+        """
+        cursor = self.db.execute_sql("SELECT status, COUNT(*) FROM caa_backup GROUP BY status")
+        counts_by_value = dict(cursor.fetchall())
+        return {status_enum.name: counts_by_value.get(status_enum.value, 0) for status_enum in CoverStatus}
 
+    @_retry_on_locked
     def get_last_import_timestamp(self):
         """
         Retrieves the timestamp of the last successful import.
         Returns:
             datetime: The timestamp of the last import, or None if no imports have been done.
         """
-        while True:
-            try:
-                last_record = ImportTimestamp.select().order_by(ImportTimestamp.last_import_date.desc()).first()
-                return last_record.last_import_date if last_record else None
-            except peewee.OperationalError as err:
-                if "database is locked" in str(err):
-                    time.sleep(DB_RETRY_DELAY_SECONDS)
-                    continue
-                raise err
+        last_record = ImportTimestamp.select().order_by(ImportTimestamp.last_import_date.desc()).first()
+        return last_record.last_import_date if last_record else None
 
+    @_retry_on_locked
     def update_import_timestamp(self, timestamp):
         """
         Updates the import timestamp to record the last successful import.
         Args:
             timestamp (datetime): The timestamp to record.
         """
-        while True:
-            try:
-                with self.db.atomic():
-                    # Delete old timestamps and insert the new one
-                    ImportTimestamp.delete().execute()
-                    ImportTimestamp.create(last_import_date=timestamp)
-                return
-            except peewee.OperationalError as err:
-                if "database is locked" in str(err):
-                    time.sleep(DB_RETRY_DELAY_SECONDS)
-                    continue
-                raise err
+        # One INSERT OR REPLACE against a fixed-id row instead of
+        # delete-all-then-insert: a single statement, and the table is
+        # never briefly empty for concurrent readers.
+        ImportTimestamp.replace(id=1, last_import_date=timestamp).execute()
 
     def __enter__(self):
         """Context manager entry point. Opens the database connection."""
@@ -31,16 +31,27 @@ def _make_record():
     return record
 
 
-@patch("caa_downloader.requests.get")
-def test_successful_download(mock_get, db_setup, tmp_path):
-    dl = _make_downloader(db_setup, tmp_path)
+def _make_response(content=b"fake image data", raise_for_status=None):
+    """Build a mock streaming response usable as a context manager."""
+    import io
+
     mock_response = MagicMock()
     mock_response.status_code = 200
-    mock_response.content = b"fake image data"
-    mock_response.raise_for_status = MagicMock()
-    mock_get.return_value = mock_response
+    mock_response.raw = io.BytesIO(content)
+    if raise_for_status is not None:
+        mock_response.raise_for_status.side_effect = raise_for_status
+    mock_response.__enter__ = MagicMock(return_value=mock_response)
+    mock_response.__exit__ = MagicMock(return_value=False)
+    return mock_response
+
+
+@patch("caa_downloader.requests.Session.get")
+def test_successful_download(mock_get, db_setup, tmp_path):
+    dl = _make_downloader(db_setup, tmp_path)
+    mock_get.return_value = _make_response()
 
     result = dl._download_and_save_record(_make_record())
+    dl._flush_pending_updates()
 
     assert result == (MBID, 1000)
     filepath = os.path.join(dl.images_dir, "a", "b", f"{MBID}-1000.jpg")
@@ -53,15 +64,16 @@ def test_successful_download(mock_get, db_setup, tmp_path):
         assert record_db.status == CoverStatus.DOWNLOADED.value
 
 
-@patch("caa_downloader.requests.get")
+@patch("caa_downloader.requests.Session.get")
 def test_http_404_permanent_error(mock_get, db_setup, tmp_path):
     dl = _make_downloader(db_setup, tmp_path)
-    mock_response = MagicMock()
+    mock_response = _make_response()
     mock_response.status_code = 404
     mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=mock_response)
     mock_get.return_value = mock_response
 
     result = dl._download_and_save_record(_make_record())
+    dl._flush_pending_updates()
 
     assert result == (None, None)
     with dl.datastore:
@@ -69,15 +81,16 @@ def test_http_404_permanent_error(mock_get, db_setup, tmp_path):
         assert record_db.status == CoverStatus.PERMANENT_ERROR.value
 
 
-@patch("caa_downloader.requests.get")
+@patch("caa_downloader.requests.Session.get")
 def test_http_500_temp_error(mock_get, db_setup, tmp_path):
     dl = _make_downloader(db_setup, tmp_path)
-    mock_response = MagicMock()
+    mock_response = _make_response()
     mock_response.status_code = 500
     mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=mock_response)
     mock_get.return_value = mock_response
 
     result = dl._download_and_save_record(_make_record())
+    dl._flush_pending_updates()
 
     assert result == (None, None)
     with dl.datastore:
@@ -85,12 +98,13 @@ def test_http_500_temp_error(mock_get, db_setup, tmp_path):
         assert record_db.status == CoverStatus.TEMP_ERROR.value
 
 
-@patch("caa_downloader.requests.get")
+@patch("caa_downloader.requests.Session.get")
 def test_timeout_temp_error(mock_get, db_setup, tmp_path):
     dl = _make_downloader(db_setup, tmp_path)
     mock_get.side_effect = requests.exceptions.Timeout("Connection timed out")
 
     result = dl._download_and_save_record(_make_record())
+    dl._flush_pending_updates()
 
     assert result == (None, None)
     with dl.datastore:
@@ -98,15 +112,26 @@ def test_timeout_temp_error(mock_get, db_setup, tmp_path):
         assert record_db.status == CoverStatus.TEMP_ERROR.value
 
 
-def test_missing_attributes(db_setup, tmp_path):
+@patch("caa_downloader.requests.Session.get")
+def test_existing_file_skips_download(mock_get, db_setup, tmp_path):
+    """A non-empty file already on disk is marked DOWNLOADED without any HTTP request."""
     dl = _make_downloader(db_setup, tmp_path)
-    record = MagicMock(spec=[])
-    del record.release_mbid
-    result = dl._download_and_save_record(record)
-    assert result == (None, None)
+    filepath = os.path.join(dl.images_dir, "a", "b", f"{MBID}-1000.jpg")
+    os.makedirs(os.path.dirname(filepath))
+    with open(filepath, "wb") as f:
+        f.write(b"already here")
+
+    result = dl._download_and_save_record(_make_record())
+    dl._flush_pending_updates()
+
+    assert result == (MBID, 1000)
+    mock_get.assert_not_called()
+    with dl.datastore:
+        record_db = dl.datastore.get(1000)
+        assert record_db.status == CoverStatus.DOWNLOADED.value
 
 
-@patch("caa_downloader.requests.get")
+@patch("caa_downloader.requests.Session.get")
 def test_download_verifies_against_metadata(mock_get, db_setup, tmp_path):
     """Successful download is verified against IA metadata if available."""
     import gzip
@@ -124,13 +149,10 @@ def test_download_verifies_against_metadata(mock_get, db_setup, tmp_path):
         json.dump(metadata, f)
 
     # Download returns content matching expected size
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.content = b"x" * 15  # matches expected size
-    mock_response.raise_for_status = MagicMock()
-    mock_get.return_value = mock_response
+    mock_get.return_value = _make_response(content=b"x" * 15)
 
     result = dl._download_and_save_record(_make_record())
+    dl._flush_pending_updates()
     assert result == (MBID, 1000)
 
     with dl.datastore:
@@ -138,7 +160,7 @@ def test_download_verifies_against_metadata(mock_get, db_setup, tmp_path):
         assert record_db.status == CoverStatus.DOWNLOADED.value
 
 
-@patch("caa_downloader.requests.get")
+@patch("caa_downloader.requests.Session.get")
 def test_download_fails_verification_size_mismatch(mock_get, db_setup, tmp_path):
     """Download marked as TEMP_ERROR if size doesn't match metadata."""
     import gzip
@@ -156,16 +178,36 @@ def test_download_fails_verification_size_mismatch(mock_get, db_setup, tmp_path)
         json.dump(metadata, f)
 
     # Download returns content with wrong size
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.content = b"short"  # doesn't match expected 1000
-    mock_response.raise_for_status = MagicMock()
-    mock_get.return_value = mock_response
+    mock_get.return_value = _make_response(content=b"short")  # doesn't match expected 1000
 
     result = dl._download_and_save_record(_make_record())
+    dl._flush_pending_updates()
     assert result == (MBID, 1000)  # still returns success (file was written)
 
     with dl.datastore:
         record_db = dl.datastore.get(1000)
         assert record_db.status == CoverStatus.TEMP_ERROR.value
         assert "integrity" in record_db.error
+
+
+@patch("caa_downloader.requests.Session.get")
+def test_mid_stream_read_error_temp_error(mock_get, db_setup, tmp_path):
+    """A failure while reading the body lands in TEMP_ERROR and removes the temp file."""
+    import urllib3
+
+    dl = _make_downloader(db_setup, tmp_path)
+    mock_response = _make_response()
+    mock_response.raw = MagicMock()
+    mock_response.raw.read.side_effect = urllib3.exceptions.ProtocolError("Connection broken mid-body")
+    mock_get.return_value = mock_response
+
+    result = dl._download_and_save_record(_make_record())
+    dl._flush_pending_updates()
+
+    assert result == (None, None)
+    filepath = os.path.join(dl.images_dir, "a", "b", f"{MBID}-1000.jpg")
+    assert not os.path.exists(filepath)
+    assert not os.path.exists(filepath + ".tmp")
+    with dl.datastore:
+        record_db = dl.datastore.get(1000)
+        assert record_db.status == CoverStatus.TEMP_ERROR.value
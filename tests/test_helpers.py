@@ -67,3 +67,14 @@ def test_parse_ia_filename_invalid():
     assert parse_ia_filename("__ia_thumb.jpg") is None
     assert parse_ia_filename("history/files/index.json") is None
     assert parse_ia_filename("ab5245f6-ae8d-49a5-be42-6347f6c0330e-1000.jpg") is None  # missing mbid- prefix
+
+
+def test_count_files(tmp_path):
+    from helpers import count_files
+
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "one.jpg").write_bytes(b"x")
+    (tmp_path / "a" / "b" / "two.jpg").write_bytes(b"x")
+    (tmp_path / "top.jpg").write_bytes(b"x")
+    assert count_files(str(tmp_path)) == 3
+    assert count_files(str(tmp_path / "missing")) == 0
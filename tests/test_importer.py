@@ -17,9 +17,6 @@ def test_incremental_import_fetches_new_records(mock_connect, db_setup):
     mock_connect.return_value = mock_conn
     new_ts = datetime(2025, 5, 14, 12, 0, 0, tzinfo=timezone.utc)
 
-    mock_count_cursor = MagicMock()
-    mock_count_cursor.fetchone.return_value = (2,)
-
     mock_data_cursor = MagicMock()
     mock_data_cursor.fetchmany.side_effect = [
         [
@@ -29,12 +26,10 @@ def test_incremental_import_fetches_new_records(mock_connect, db_setup):
         [],
     ]
 
-    mock_max_cursor = MagicMock()
-    mock_max_cursor.fetchone.return_value = (new_ts,)
+    mock_index_cursor = MagicMock()
+    mock_index_cursor.fetchone.return_value = (1,)
 
-    mock_conn.cursor.return_value.__enter__ = MagicMock(
-        side_effect=[mock_count_cursor, mock_data_cursor, mock_max_cursor]
-    )
+    mock_conn.cursor.return_value.__enter__ = MagicMock(side_effect=[mock_index_cursor, mock_data_cursor])
     mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
 
     imp = CAAImporter(pg_conn_string="dbname=test", db_path=db_path, batch_size=100)
@@ -59,10 +54,13 @@ def test_incremental_import_no_new_records(mock_connect, db_setup):
     mock_conn = MagicMock()
     mock_connect.return_value = mock_conn
 
-    mock_count_cursor = MagicMock()
-    mock_count_cursor.fetchone.return_value = (0,)
+    mock_data_cursor = MagicMock()
+    mock_data_cursor.fetchmany.side_effect = [[]]
+
+    mock_index_cursor = MagicMock()
+    mock_index_cursor.fetchone.return_value = (1,)
 
-    mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_count_cursor)
+    mock_conn.cursor.return_value.__enter__ = MagicMock(side_effect=[mock_index_cursor, mock_data_cursor])
     mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
 
     imp = CAAImporter(pg_conn_string="dbname=test", db_path=db_path, batch_size=100)
@@ -103,21 +101,16 @@ def test_incremental_import_updates_timestamp_even_with_duplicates(mock_connect,
     mock_conn = MagicMock()
     mock_connect.return_value = mock_conn
 
-    mock_count_cursor = MagicMock()
-    mock_count_cursor.fetchone.return_value = (1,)
-
     mock_data_cursor = MagicMock()
     mock_data_cursor.fetchmany.side_effect = [
         [(5000, "aaaa-bbbb-cccc-dddd-eeeeeeeeeeee", "image/jpeg", new_ts)],
         [],
     ]
 
-    mock_max_cursor = MagicMock()
-    mock_max_cursor.fetchone.return_value = (new_ts,)
+    mock_index_cursor = MagicMock()
+    mock_index_cursor.fetchone.return_value = (1,)
 
-    mock_conn.cursor.return_value.__enter__ = MagicMock(
-        side_effect=[mock_count_cursor, mock_data_cursor, mock_max_cursor]
-    )
+    mock_conn.cursor.return_value.__enter__ = MagicMock(side_effect=[mock_index_cursor, mock_data_cursor])
     mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
 
     imp = CAAImporter(pg_conn_string="dbname=test", db_path=db_path, batch_size=100)
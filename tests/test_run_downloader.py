@@ -53,7 +53,7 @@ def test_run_downloader_shutdown_flag(db_setup, tmp_path):
     assert counts["NOT_DOWNLOADED"] == 10
 
 
-@patch("caa_downloader.requests.get")
+@patch("caa_downloader.requests.Session.get")
 def test_run_downloader_downloads_pending(mock_get, db_setup, tmp_path):
     ds, db_path = db_setup
     images_dir = str(tmp_path / "images")
@@ -65,10 +65,13 @@ def test_run_downloader_downloads_pending(mock_get, db_setup, tmp_path):
         ]
     )
 
+    import io
+
     mock_response = MagicMock()
     mock_response.status_code = 200
-    mock_response.content = b"image data"
-    mock_response.raise_for_status = MagicMock()
+    mock_response.raw = io.BytesIO(b"image data")
+    mock_response.__enter__ = MagicMock(return_value=mock_response)
+    mock_response.__exit__ = MagicMock(return_value=False)
     mock_get.return_value = mock_response
 
     dl = CAADownloader(db_path=db_path, images_dir=images_dir, download_threads=2)
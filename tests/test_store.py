@@ -119,3 +119,35 @@ def test_import_timestamp(db_setup):
     assert ds.get_last_import_timestamp() is None
     ds.update_import_timestamp(ts)
     assert ds.get_last_import_timestamp() == ts
+
+
+def test_read_only_mode(db_setup):
+    import peewee
+    import pytest
+
+    from store import CAABackupDataStore
+
+    ds, db_path = db_setup
+    ds.bulk_add([{"caa_id": 1, "release_mbid": "a", "mime_type": "image/jpeg", "status": CoverStatus.DOWNLOADED}])
+
+    with CAABackupDataStore(db_path, read_only=True) as ro:
+        assert ro.get(1).release_mbid == "a"
+        assert ro.get_status_counts()["DOWNLOADED"] == 1
+        with pytest.raises(peewee.OperationalError):
+            ro.update(caa_id=1, release_mbid="a", new_status=CoverStatus.NOT_DOWNLOADED)
+
+
+def test_has_undownloaded(db_setup):
+    ds, _ = db_setup
+    assert ds.has_undownloaded() is False
+    ds.bulk_add([{"caa_id": 1, "release_mbid": "a", "mime_type": "image/jpeg", "status": CoverStatus.NOT_DOWNLOADED}])
+    assert ds.has_undownloaded() is True
+    ds.update(caa_id=1, release_mbid="a", new_status=CoverStatus.DOWNLOADED)
+    assert ds.has_undownloaded() is False
+
+
+def test_get_status(db_setup):
+    ds, _ = db_setup
+    ds.bulk_add([{"caa_id": 1, "release_mbid": "a", "mime_type": "image/jpeg", "status": CoverStatus.DOWNLOADED}])
+    assert ds.get_status(1) == (CoverStatus.DOWNLOADED.value, "image/jpeg")
+    assert ds.get_status(999) is None
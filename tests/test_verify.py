@@ -137,3 +137,23 @@ def test_verifier_handles_multiple_extensions(db_setup, tmp_path):
     counts = ds.get_status_counts()
     assert counts["DOWNLOADED"] == 3
     assert counts.get("NOT_DOWNLOADED", 0) == 0
+
+
+def test_verifier_scan_propagates_db_errors(db_setup, tmp_path):
+    """A database failure while flushing scan batches surfaces instead of hanging the pool."""
+    import pytest
+
+    ds, db_path = db_setup
+    images_dir = str(tmp_path / "images")
+    os.makedirs(images_dir)
+    for caa_id in range(1000, 1020):
+        _create_image_file(images_dir, MBID_A, caa_id)
+
+    verifier = CAAVerifier(db_path=db_path, images_dir=images_dir)
+
+    def _boom(caa_ids):
+        raise RuntimeError("disk full")
+
+    verifier.datastore.bulk_update_downloaded_status = _boom
+    with pytest.raises(RuntimeError):
+        verifier._scan_and_update(batch_size=2, scan_threads=1)